@@ -9,13 +9,13 @@
 
 import abc
 import time
-from collections import defaultdict, OrderedDict
-from itertools import chain
+from collections import defaultdict
+from itertools import islice
 
 from scapy.compat import Any, Union, List, Optional, Iterable, \
-    Dict, Tuple, Set, Callable, cast, NamedTuple, orb
+    Iterator, Dict, Tuple, Set, Callable, cast, NamedTuple, orb
 from scapy.error import Scapy_Exception, log_interactive
-from scapy.utils import make_lined_table, EDecimal
+from scapy.utils import make_lined_table
 import scapy.modules.six as six
 from scapy.packet import Packet
 from scapy.contrib.automotive.ecu import EcuState, EcuResponse
@@ -26,35 +26,110 @@ from scapy.contrib.automotive.scanner.configuration import \
 from scapy.contrib.automotive.scanner.graph import _Edge
 
 
-# Definition outside the class ServiceEnumerator to allow pickling
+# Definition outside the class ServiceEnumerator to allow pickling.
+# The results are plain tuples without a per-instance __dict__. They are
+# indexed and unpacked as tuples, e.g. by the OBD enumerators.
 _AutomotiveTestCaseScanResult = NamedTuple(
     "_AutomotiveTestCaseScanResult",
     [("state", EcuState),
      ("req", Packet),
      ("resp", Optional[Packet]),
-     ("req_ts", Union[EDecimal, float]),
-     ("resp_ts", Optional[Union[EDecimal, float]])])
+     ("req_ts", float),
+     ("resp_ts", Optional[float])])
 
 _AutomotiveTestCaseFilteredScanResult = NamedTuple(
     "_AutomotiveTestCaseFilteredScanResult",
     [("state", EcuState),
      ("req", Packet),
      ("resp", Packet),
-     ("req_ts", Union[EDecimal, float]),
-     ("resp_ts", Union[EDecimal, float])])
+     ("req_ts", float),
+     ("resp_ts", float)])
+
+
+class _AnswerTimeStatistics(object):
+    """ Number, sum, minimum and maximum of answer times """
+
+    def __init__(self):
+        # type: () -> None
+        self.count = 0
+        self.sum = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def add(self, answer_time):
+        # type: (float) -> None
+        if self.count == 0:
+            self.min = self.max = answer_time
+        elif answer_time < self.min:
+            self.min = answer_time
+        elif answer_time > self.max:
+            self.max = answer_time
+        self.count += 1
+        self.sum += answer_time
+
+
+class _ScanStatistics(object):
+    """ Statistics of scan results, updated with every stored result """
+
+    def __init__(self):
+        # type: () -> None
+        self.num_answered = 0
+        self.num_unanswered = 0
+        self.num_negative_resps = 0
+        self.answertime = _AnswerTimeStatistics()
+        self.answertime_nr = _AnswerTimeStatistics()
+        self.answertime_pr = _AnswerTimeStatistics()
+
+    def add(self, result):
+        # type: (_AutomotiveTestCaseScanResult) -> None
+        if result.resp is None:
+            self.num_unanswered += 1
+            return
+        self.num_answered += 1
+        is_nr = result.resp.service == 0x7f
+        if is_nr:
+            self.num_negative_resps += 1
+        answer_time = cast(float, result.resp_ts) - result.req_ts
+        self.answertime.add(answer_time)
+        if is_nr:
+            self.answertime_nr.add(answer_time)
+        else:
+            self.answertime_pr.add(answer_time)
 
 
 @six.add_metaclass(abc.ABCMeta)
 class ServiceEnumerator(AutomotiveTestCase):
     """ Base class for ServiceEnumerators of automotive diagnostic protocols"""
 
+    # Negative response codes which end the execution of a state if
+    # exit_if_service_not_supported is set
+    _service_not_supported_nrcs = {
+        0x11: "serviceNotSupported",
+        0x7f: "serviceNotSupportedInActiveSession"}  # type: Dict[int, str]
+
     def __init__(self):
         # type: () -> None
         super(ServiceEnumerator, self).__init__()
-        self.__result_packets = OrderedDict()  # type: Dict[bytes, Packet]
+        self.__result_packets = dict()  # type: Dict[bytes, Packet]
+        # Stored packets with the response bit 0x40 set in the first byte
+        self.__response_packets = list()  # type: List[Packet]
         self._results = list()  # type: List[_AutomotiveTestCaseScanResult]
+        # Partitions of self._results, maintained by _store_result
+        self._results_answered = list()  # type: List[_AutomotiveTestCaseFilteredScanResult]  # noqa: E501
+        self._results_unanswered = list()  # type: List[_AutomotiveTestCaseScanResult]  # noqa: E501
+        self._results_nr = list()  # type: List[_AutomotiveTestCaseFilteredScanResult]  # noqa: E501
+        self._results_pr = list()  # type: List[_AutomotiveTestCaseFilteredScanResult]  # noqa: E501
+        self._scanned_states = set()  # type: Set[EcuState]
+        self._nrc_counts = defaultdict(int)  # type: Dict[int, int]
+        # Negative response codes of stored responses, keyed by object id
+        self._nrc_cache = dict()  # type: Dict[int, int]
+        # EcuState.is_modifier_pkt of stored responses, keyed by object id
+        self._modifier_cache = dict()  # type: Dict[int, bool]
+        # Statistics of all results and per state
+        self._statistics = _ScanStatistics()
+        self._state_statistics = dict()  # type: Dict[EcuState, _ScanStatistics]  # noqa: E501
         self._request_iterators = dict()  # type: Dict[EcuState, Iterable[Packet]]  # noqa: E501
-        self._retry_pkt = defaultdict(lambda: None)  # type: Dict[EcuState, Optional[Union[Packet, Iterable[Packet]]]]  # noqa: E501
+        self._retry_pkt = dict()  # type: Dict[EcuState, Optional[Union[Packet, Iterable[Packet]]]]  # noqa: E501
         self._negative_response_blacklist = [0x10, 0x11]  # type: List[int]
 
     @staticmethod
@@ -94,6 +169,8 @@ class ServiceEnumerator(AutomotiveTestCase):
 
     def __reduce__(self):  # type: ignore
         f, t, d = super(ServiceEnumerator, self).__reduce__()  # type: ignore
+        # d is the __dict__ of this object, don't modify it
+        d = dict(d)
         try:
             del d["_request_iterators"]
         except KeyError:
@@ -105,6 +182,22 @@ class ServiceEnumerator(AutomotiveTestCase):
             pass
         return f, t, d
 
+    def __setstate__(self, state):
+        # type: (Dict[str, Any]) -> None
+        self.__dict__.update(state)
+        # Object ids are not preserved by pickle, rebuild the caches once
+        # for every stored response
+        self._nrc_cache = dict()
+        for r in self._results_nr:
+            if id(r.resp) not in self._nrc_cache:
+                self._nrc_cache[id(r.resp)] = \
+                    self._get_negative_response_code(r.resp)
+        self._modifier_cache = dict()
+        for r in self._results_answered:
+            if id(r.resp) not in self._modifier_cache:
+                self._modifier_cache[id(r.resp)] = \
+                    EcuState.is_modifier_pkt(r.resp)
+
     @property
     def negative_response_blacklist(self):
         # type: () -> List[int]
@@ -113,29 +206,74 @@ class ServiceEnumerator(AutomotiveTestCase):
     @property
     def completed(self):
         # type: () -> bool
-        if len(self._results):
-            return all([self.has_completed(s) for s in self.scanned_states])
+        if self._results:
+            return all(self.has_completed(s) for s in self._scanned_states)
         else:
             return super(ServiceEnumerator, self).completed
 
+    def __store_packet(self, pkt):
+        # type: (Packet) -> Packet
+        # Serialize every packet only once and reuse an already stored,
+        # identical packet instead of the new one
+        raw = bytes(pkt)
+        try:
+            return self.__result_packets[raw]
+        except KeyError:
+            self.__result_packets[raw] = pkt
+            if raw and orb(raw[0]) & 0x40:
+                self.__response_packets.append(pkt)
+            return pkt
+
     def _store_result(self, state, req, res):
         # type: (EcuState, Packet, Optional[Packet]) -> None
-        if bytes(req) not in self.__result_packets:
-            self.__result_packets[bytes(req)] = req
-
-        if res and bytes(res) not in self.__result_packets:
-            self.__result_packets[bytes(res)] = res
+        stored_req = self.__store_packet(req)
+        stored_res = self.__store_packet(res) if res is not None else None
 
-        self._results.append(_AutomotiveTestCaseScanResult(
+        # Convert the EDecimal timestamps only once
+        result = _AutomotiveTestCaseScanResult(
             state,
-            self.__result_packets[bytes(req)],
-            self.__result_packets[bytes(res)] if res is not None else None,
-            req.sent_time or 0.0,
-            res.time if res is not None else None))
+            stored_req,
+            stored_res,
+            float(req.sent_time or 0.0),
+            float(res.time) if res is not None else None)
+
+        self._results.append(result)
+        self._scanned_states.add(state)
+        self.__update_statistics(result)
+
+        if stored_res is None:
+            self._results_unanswered.append(result)
+            return
+
+        if id(stored_res) not in self._modifier_cache:
+            self._modifier_cache[id(stored_res)] = \
+                EcuState.is_modifier_pkt(stored_res)
+
+        fr = cast(_AutomotiveTestCaseFilteredScanResult, result)
+        self._results_answered.append(fr)
+        if stored_res.service == 0x7f:
+            self._results_nr.append(fr)
+            try:
+                nrc = self._nrc_cache[id(stored_res)]
+            except KeyError:
+                nrc = self._get_negative_response_code(stored_res)
+                self._nrc_cache[id(stored_res)] = nrc
+            self._nrc_counts[nrc] += 1
+        else:
+            self._results_pr.append(fr)
+
+    def _is_modifier_response(self, response):
+        # type: (Packet) -> bool
+        # The cache is keyed by the stored packet with the same bytes
+        stored = self.__result_packets.get(bytes(response), response)
+        try:
+            return self._modifier_cache[id(stored)]
+        except KeyError:
+            return EcuState.is_modifier_pkt(response)
 
     def __get_retry_iterator(self, state):
         # type: (EcuState) -> Iterable[Packet]
-        retry_entry = self._retry_pkt[state]
+        retry_entry = self._retry_pkt.get(state)
         if retry_entry is None:
             return []
         elif isinstance(retry_entry, Packet):
@@ -152,17 +290,165 @@ class ServiceEnumerator(AutomotiveTestCase):
 
         return self._request_iterators[state]
 
-    def __get_request_iterator(self, state, **kwargs):
-        # type: (EcuState, Optional[Dict[str, Any]]) -> Iterable[Packet]
-        return chain(self.__get_retry_iterator(state),
-                     self.__get_initial_request_iterator(state, **kwargs))
+    def __retry_unevaluated_requests(self,
+                                     state,  # type: EcuState
+                                     retry_entry,  # type: Optional[Union[Packet, Iterable[Packet]]]  # noqa: E501
+                                     pending  # type: List[Packet]
+                                     ):
+        # type: (...) -> None
+        """
+        Stores requests, which were taken from the request iterators but
+        not evaluated before the execution stopped, in the retry slot of a
+        state. They are sent first in the next execution.
+
+        :param state: Current state
+        :param retry_entry: Retry entry at the start of the execution. Its
+                            requests were moved to pending.
+        :param pending: Requests which were not evaluated
+        """
+        if self.has_completed(state):
+            return
+        entry = self._retry_pkt.get(state)
+        if entry is retry_entry:
+            # The requests of this entry were evaluated or are pending
+            entry = None
+        if not pending:
+            self._retry_pkt[state] = entry
+            return
+        if entry is None:
+            requests = list()  # type: List[Packet]
+        elif isinstance(entry, Packet):
+            requests = [entry]
+        else:
+            requests = list(entry)
+        self._retry_pkt[state] = requests + pending
+
+    def __prepare_retry(self,
+                        state,  # type: EcuState
+                        retry_entry,  # type: Optional[Union[Packet, Iterable[Packet]]]  # noqa: E501
+                        pending,  # type: List[Packet]
+                        exception  # type: Exception
+                        ):
+        # type: (...) -> None
+        if self._retry_pkt.get(state) is None:
+            log_interactive.debug(
+                "[-] Exception '%s' in execute. Prepare for retry", exception)
+        else:
+            log_interactive.critical(
+                "[-] Exception during retry. This is bad")
+        self.__retry_unevaluated_requests(state, retry_entry, pending)
+
+    def __get_responses(self,
+                        socket,  # type: _SocketUnion
+                        state,  # type: EcuState
+                        requests,  # type: Iterator[Packet]
+                        timeout,  # type: Union[int, float]
+                        retry_entry,  # type: Optional[Union[Packet, Iterable[Packet]]]  # noqa: E501
+                        pending  # type: List[Packet]
+                        ):
+        # type: (...) -> Iterator[Tuple[Packet, Optional[Packet]]]
+        """
+        Sends the pending requests, followed by the requests of the
+        iterator, one by one with sr1. A request is removed from pending
+        when it is yielded together with its response.
+        """
+        # Resolve the bound method once instead of for every request
+        sr1 = socket.sr1
+
+        while True:
+            if not pending:
+                try:
+                    pending.append(next(requests))
+                except StopIteration:
+                    return
+            req = pending[0]
+            try:
+                res = sr1(req, timeout=timeout, verbose=False)
+            except (OSError, ValueError, Scapy_Exception) as e:
+                self.__prepare_retry(state, retry_entry, pending, e)
+                raise e
+            del pending[0]
+            yield req, res
+
+    def __get_batched_responses(self,
+                                socket,  # type: _SocketUnion
+                                state,  # type: EcuState
+                                requests,  # type: Iterator[Packet]
+                                timeout,  # type: Union[int, float]
+                                retry_entry,  # type: Optional[Union[Packet, Iterable[Packet]]]  # noqa: E501
+                                pending,  # type: List[Packet]
+                                batch_size  # type: int
+                                ):
+        # type: (...) -> Iterator[Tuple[Packet, Optional[Packet]]]
+        """
+        Sends the pending requests, followed by the requests of the
+        iterator, in batches of batch_size packets with a single call of
+        sr. A request is removed from pending when it is yielded together
+        with its response.
+
+        sr matches the responses with Packet.answers, which can't tell
+        requests of the same service apart by negative responses. The
+        matches are only reliable if every request of a batch is answered,
+        otherwise the batch is sent again one by one with sr1.
+        """
+        sr = socket.sr
+        sr1 = socket.sr1
+
+        while True:
+            if len(pending) < batch_size:
+                pending.extend(islice(requests, batch_size - len(pending)))
+            if not pending:
+                return
+            batch = pending[:batch_size]
+            try:
+                # prebuild keeps the given packet objects as sent packets
+                ans, _ = sr(batch, timeout=timeout, verbose=False,
+                            prebuild=True)
+            except (OSError, ValueError, Scapy_Exception) as e:
+                self.__prepare_retry(state, retry_entry, pending, e)
+                raise e
+
+            if len(ans) < len(batch):
+                for req in batch:
+                    try:
+                        res = sr1(req, timeout=timeout, verbose=False)
+                    except (OSError, ValueError, Scapy_Exception) as e:
+                        self.__prepare_retry(state, retry_entry, pending, e)
+                        raise e
+                    del pending[0]
+                    yield req, res
+                continue
+
+            answers = dict((id(snd), rcv) for snd, rcv in ans)
+            for req in batch:
+                del pending[0]
+                yield req, answers[id(req)]
 
     def execute(self, socket, state, **kwargs):
         # type: (_SocketUnion, EcuState, Any) -> None
         timeout = kwargs.pop('timeout', 1)
         execution_time = kwargs.pop("execution_time", 1200)
+        request_batch_size = kwargs.pop("request_batch_size", 1)
+        # Options of _evaluate_response, parsed once for all requests
+        exit_if_no_answer_received = \
+            kwargs.pop("exit_if_no_answer_received", False)
+        exit_if_service_not_supported = \
+            kwargs.pop("exit_if_service_not_supported", False)
+        retry_if_busy_returncode = \
+            kwargs.pop("retry_if_busy_returncode", True)
+        exit_scan_on_first_negative_response = \
+            kwargs.pop("exit_scan_on_first_negative_response", False)
+
+        # Requests are sent in batches, including pending retries, unless
+        # the scan stops on the first negative response
+        batched = request_batch_size > 1 and \
+            not exit_scan_on_first_negative_response
 
-        it = self.__get_request_iterator(state, **kwargs)
+        # Requests which were taken from the request iterators but not
+        # evaluated yet. Retries of the last execution are sent first.
+        retry_entry = self._retry_pkt.get(state)
+        pending = list(self.__get_retry_iterator(state))
+        it = iter(self.__get_initial_request_iterator(state, **kwargs))
 
         # log_interactive.debug("[i] Using iterator %s in state %s", it, state)
 
@@ -170,34 +456,40 @@ class ServiceEnumerator(AutomotiveTestCase):
         log_interactive.debug(
             "[i] Start execution of enumerator: %s", time.ctime(start_time))
 
-        for req in it:
-            try:
-                res = socket.sr1(req, timeout=timeout, verbose=False)
-            except (OSError, ValueError, Scapy_Exception) as e:
-                if self._retry_pkt[state] is None:
-                    log_interactive.debug(
-                        "[-] Exception '%s' in execute. Prepare for retry", e)
-                    self._retry_pkt[state] = req
-                else:
-                    log_interactive.critical(
-                        "[-] Exception during retry. This is bad")
-                raise e
+        if batched:
+            responses = self.__get_batched_responses(
+                socket, state, it, timeout, retry_entry, pending,
+                request_batch_size)
+        else:
+            responses = self.__get_responses(
+                socket, state, it, timeout, retry_entry, pending)
 
+        for req, res in responses:
             if socket.closed:
                 log_interactive.critical("[-] Socket closed during scan.")
+                pending.insert(0, req)
+                self.__retry_unevaluated_requests(state, retry_entry, pending)
                 return
 
             self._store_result(state, req, res)
 
-            if self._evaluate_response(state, req, res, **kwargs):
+            if self._evaluate_response(
+                    state, req, res,
+                    exit_if_no_answer_received=exit_if_no_answer_received,
+                    exit_if_service_not_supported=exit_if_service_not_supported,  # noqa: E501
+                    retry_if_busy_returncode=retry_if_busy_returncode,
+                    exit_scan_on_first_negative_response=exit_scan_on_first_negative_response,  # noqa: E501
+                    **kwargs):
                 log_interactive.debug("[i] Stop test_case execution because "
                                       "of response evaluation")
+                self.__retry_unevaluated_requests(state, retry_entry, pending)
                 return
 
             if (start_time + execution_time) < time.time():
                 log_interactive.debug(
                     "[i] Finished execution time of enumerator: %s",
                     time.ctime())
+                self.__retry_unevaluated_requests(state, retry_entry, pending)
                 return
 
         log_interactive.info("[i] Finished iterator execution")
@@ -209,30 +501,28 @@ class ServiceEnumerator(AutomotiveTestCase):
                            state,  # type: EcuState
                            request,  # type: Packet
                            response,  # type: Optional[Packet]
-                           **kwargs  # type: Optional[Dict[str, Any]]
+                           exit_if_no_answer_received=False,  # type: bool
+                           exit_if_service_not_supported=False,  # type: bool
+                           retry_if_busy_returncode=True,  # type: bool
+                           exit_scan_on_first_negative_response=False,  # type: bool  # noqa: E501
+                           **kwargs  # type: Any
                            ):  # type: (...) -> bool  # noqa: E501
 
         if response is None:
             # Nothing to evaluate, return and continue execute
-            return cast(bool, kwargs.pop("exit_if_no_answer_received", False))
+            return exit_if_no_answer_received
 
-        exit_if_service_not_supported = \
-            kwargs.pop("exit_if_service_not_supported", False)
-        retry_if_busy_returncode = \
-            kwargs.pop("retry_if_busy_returncode", True)
-        exit_scan_on_first_negative_response = \
-            kwargs.pop("exit_scan_on_first_negative_response", False)
-
-        if exit_scan_on_first_negative_response and response.service == 0x7f:
-            return True
+        # Positive responses skip all negative response code checks
+        if response.service == 0x7f:
+            if exit_scan_on_first_negative_response:
+                return True
 
-        if exit_if_service_not_supported and response.service == 0x7f:
             response_code = self._get_negative_response_code(response)
-            if response_code in [0x11, 0x7f]:
-                names = {0x11: "serviceNotSupported",
-                         0x7f: "serviceNotSupportedInActiveSession"}
+            if exit_if_service_not_supported and \
+                    response_code in self._service_not_supported_nrcs:
                 msg = "[-] Exit execute because negative response " \
-                      "%s received!" % names[response_code]
+                      "%s received!" % \
+                      self._service_not_supported_nrcs[response_code]
                 log_interactive.debug(msg)
                 # execute of current state is completed,
                 # since a serviceNotSupported negative response was received
@@ -240,24 +530,22 @@ class ServiceEnumerator(AutomotiveTestCase):
                 # stop current execute and exit
                 return True
 
-        if retry_if_busy_returncode and response.service == 0x7f \
-                and self._get_negative_response_code(response) == 0x21:
+            if retry_if_busy_returncode and response_code == 0x21:
+                if self._retry_pkt.get(state) is None:
+                    # This was no retry since the retry_pkt is None
+                    self._retry_pkt[state] = request
+                    log_interactive.debug(
+                        "[-] Exit execute. Retry packet next time!")
+                    return True
+                else:
+                    # This was a unsuccessful retry, continue execute
+                    self._retry_pkt[state] = None
+                    log_interactive.debug("[-] Unsuccessful retry!")
+                    return False
 
-            if self._retry_pkt[state] is None:
-                # This was no retry since the retry_pkt is None
-                self._retry_pkt[state] = request
-                log_interactive.debug(
-                    "[-] Exit execute. Retry packet next time!")
-                return True
-            else:
-                # This was a unsuccessful retry, continue execute
-                self._retry_pkt[state] = None
-                log_interactive.debug("[-] Unsuccessful retry!")
-                return False
-        else:
-            self._retry_pkt[state] = None
+        self._retry_pkt[state] = None
 
-        if EcuState.is_modifier_pkt(response):
+        if self._is_modifier_response(response):
             if state != EcuState.get_modified_ecu_state(
                     response, request, state):
                 log_interactive.debug(
@@ -266,51 +554,42 @@ class ServiceEnumerator(AutomotiveTestCase):
 
         return False
 
+    def __update_statistics(self, result):
+        # type: (_AutomotiveTestCaseScanResult) -> None
+        try:
+            state_stats = self._state_statistics[result.state]
+        except KeyError:
+            state_stats = _ScanStatistics()
+            self._state_statistics[result.state] = state_stats
+
+        self._statistics.add(result)
+        state_stats.add(result)
+
     def _compute_statistics(self):
         # type: () -> List[Tuple[str, str, str]]
-        data_sets = [("all", self._results)]
+        data_sets = [("all", self._statistics)]
 
         for state in self._state_completed.keys():
-            data_sets.append((repr(state),
-                              [r for r in self._results if r.state == state]))
+            data_sets.append((repr(state), self._state_statistics.get(
+                state, _ScanStatistics())))
 
         stats = list()  # type: List[Tuple[str, str, str]]
 
-        for desc, data in data_sets:
-            answered = [r for r in data if r.resp is not None]
-            unanswered = [r for r in data if r.resp is None]
-            answertimes = [float(x.resp_ts) - float(x.req_ts) for x in answered if  # noqa: E501
-                           x.resp_ts is not None and x.req_ts is not None]
-            answertimes_nr = [float(x.resp_ts) - float(x.req_ts) for x in answered if x.resp  # noqa: E501
-                              is not None and x.resp_ts is not None and
-                              x.req_ts is not None and x.resp.service == 0x7f]
-            answertimes_pr = [float(x.resp_ts) - float(x.req_ts) for x in answered if x.resp  # noqa: E501
-                              is not None and x.resp_ts is not None and
-                              x.req_ts is not None and x.resp.service != 0x7f]
-
-            nrs = [r.resp for r in data if r.resp is not None and
-                   r.resp.service == 0x7f]
-            stats.append((desc, "num_answered", str(len(answered))))
-            stats.append((desc, "num_unanswered", str(len(unanswered))))
-            stats.append((desc, "num_negative_resps", str(len(nrs))))
-
-            for postfix, times in zip(
-                    ["", "_nr", "_pr"],
-                    [answertimes, answertimes_nr, answertimes_pr]):
-                try:
-                    ma = str(round(max(times), 5))
-                except ValueError:
-                    ma = "-"
-
-                try:
-                    mi = str(round(min(times), 5))
-                except ValueError:
-                    mi = "-"
-
-                try:
-                    avg = str(round(sum(times) / len(times), 5))
-                except (ValueError, ZeroDivisionError):
-                    avg = "-"
+        for desc, st in data_sets:
+            stats.append((desc, "num_answered", str(st.num_answered)))
+            stats.append((desc, "num_unanswered", str(st.num_unanswered)))
+            stats.append(
+                (desc, "num_negative_resps", str(st.num_negative_resps)))
+
+            for postfix, times in [("", st.answertime),
+                                   ("_nr", st.answertime_nr),
+                                   ("_pr", st.answertime_pr)]:
+                if times.count:
+                    mi = str(round(times.min, 5))
+                    ma = str(round(times.max, 5))
+                    avg = str(round(times.sum / times.count, 5))
+                else:
+                    mi = ma = avg = "-"
 
                 stats.append((desc, "answertime_min" + postfix, mi))
                 stats.append((desc, "answertime_max" + postfix, ma))
@@ -339,12 +618,8 @@ class ServiceEnumerator(AutomotiveTestCase):
 
     def _prepare_negative_response_blacklist(self):
         # type: () -> None
-        nrc_dict = defaultdict(int)  # type: Dict[int, int]
-        for nr in self.results_with_negative_response:
-            nrc_dict[self._get_negative_response_code(nr.resp)] += 1
-
         total_nr_count = len(self.results_with_negative_response)
-        for nrc, nr_count in nrc_dict.items():
+        for nrc, nr_count in self._nrc_counts.items():
             if nrc not in self.negative_response_blacklist and \
                     nr_count > 30 and (nr_count / total_nr_count) > 0.3:
                 log_interactive.info("Added NRC 0x%02x to filter", nrc)
@@ -362,29 +637,16 @@ class ServiceEnumerator(AutomotiveTestCase):
     @property
     def results_with_response(self):
         # type: () -> List[_AutomotiveTestCaseFilteredScanResult]
-        filtered_results = list()
-        for r in self._results:
-            if r.resp is None:
-                continue
-            if r.resp_ts is None:
-                continue
-            fr = cast(_AutomotiveTestCaseFilteredScanResult, r)
-            filtered_results.append(fr)
-        return filtered_results
+        return self._results_answered
 
     @property
     def filtered_results(self):
         # type: () -> List[_AutomotiveTestCaseFilteredScanResult]
-        filtered_results = list()
-
-        for r in self.results_with_response:
-            if r.resp.service != 0x7f:
-                filtered_results.append(r)
-                continue
-            nrc = self._get_negative_response_code(r.resp)
-            if nrc not in self.negative_response_blacklist:
-                filtered_results.append(r)
-        return filtered_results
+        # Only negative responses have an entry in _nrc_cache
+        blacklist = frozenset(self.negative_response_blacklist)
+        nrc_cache = self._nrc_cache
+        return [r for r in self._results_answered
+                if nrc_cache.get(id(r.resp)) not in blacklist]
 
     @property
     def scanned_states(self):
@@ -393,7 +655,7 @@ class ServiceEnumerator(AutomotiveTestCase):
         Helper function to get all sacnned states in results
         :return: all scanned states
         """
-        return set([tup.state for tup in self._results])
+        return self._scanned_states
 
     @property
     def results_with_negative_response(self):
@@ -402,8 +664,7 @@ class ServiceEnumerator(AutomotiveTestCase):
         Helper function to get all results with negative response
         :return: all results with negative response
         """
-        return [cast(_AutomotiveTestCaseFilteredScanResult, r) for r in self._results  # noqa: E501
-                if r.resp and r.resp.service == 0x7f]
+        return self._results_nr
 
     @property
     def results_with_positive_response(self):
@@ -412,8 +673,7 @@ class ServiceEnumerator(AutomotiveTestCase):
         Helper function to get all results with positive response
         :return: all results with positive response
         """
-        return [cast(_AutomotiveTestCaseFilteredScanResult, r) for r in self._results  # noqa: E501
-                if r.resp and r.resp.service != 0x7f]
+        return self._results_pr
 
     @property
     def results_without_response(self):
@@ -422,20 +682,16 @@ class ServiceEnumerator(AutomotiveTestCase):
         Helper function to get all results without response
         :return: all results without response
         """
-        return [r for r in self._results if r.resp is None]
+        return self._results_unanswered
 
     def _show_negative_response_details(self, dump=False):
         # type: (bool) -> Optional[str]
-        nrc_dict = defaultdict(int)  # type: Dict[int, int]
-        for nr in self.results_with_negative_response:
-            nrc_dict[self._get_negative_response_code(nr.resp)] += 1
-
-        s = "These negative response codes were received " + \
-            " ".join([hex(c) for c in nrc_dict.keys()]) + "\n"
-        for nrc, nr_count in nrc_dict.items():
-            s += "\tNRC 0x%02x: %s received %d times" % (
-                nrc, self._get_negative_response_desc(nrc), nr_count)
-            s += "\n"
+        lines = ["These negative response codes were received " +
+                 " ".join([hex(c) for c in self._nrc_counts.keys()])]
+        for nrc, nr_count in self._nrc_counts.items():
+            lines.append("\tNRC 0x%02x: %s received %d times" % (
+                nrc, self._get_negative_response_desc(nrc), nr_count))
+        s = "\n".join(lines) + "\n"
 
         if dump:
             return s + "\n"
@@ -468,12 +724,16 @@ class ServiceEnumerator(AutomotiveTestCase):
 
     def _show_results_information(self, dump, filtered):
         # type: (bool, bool) -> Optional[str]
+        # Resolve the bound methods once, not for every table row
+        get_x = self._get_table_entry_x
+        get_y = self._get_table_entry_y
+        get_z = self._get_table_entry_z
+
         def _get_table_entry(
                 tup  # type: _AutomotiveTestCaseScanResult
         ):  # type: (...) -> Tuple[str, str, str]
-            return self._get_table_entry_x(tup), \
-                self._get_table_entry_y(tup), \
-                self._get_table_entry_z(tup)
+            return get_x(tup), get_y(tup), get_z(tup)
+
         s = "=== No data to display ===\n"
         data = self._results if not filtered else self.filtered_results  # type: Union[List[_AutomotiveTestCaseScanResult], List[_AutomotiveTestCaseFilteredScanResult]]  # noqa: E501
         if len(data):
@@ -509,27 +769,29 @@ class ServiceEnumerator(AutomotiveTestCase):
         # type: (Optional[Packet], Union[Callable[[Packet], str], str]) -> str
         if response is None:
             return "Timeout"
-        elif orb(bytes(response)[0]) == 0x7f:
+        elif response.service == 0x7f:
             return self._get_negative_response_label(response)
+        elif callable(positive_case):
+            return positive_case(response)
+        elif isinstance(positive_case, six.string_types):
+            return cast(str, positive_case)
         else:
-            if isinstance(positive_case, six.string_types):
-                return cast(str, positive_case)
-            elif callable(positive_case):
-                return positive_case(response)
-            else:
-                raise Scapy_Exception("Unsupported Type for positive_case. "
-                                      "Provide a string or a function.")
+            raise Scapy_Exception("Unsupported Type for positive_case. "
+                                  "Provide a string or a function.")
 
     @property
     def supported_responses(self):
         # type: () -> List[EcuResponse]
 
+        # Responses are stored only once in __result_packets, so all
+        # results with the same response reference the identical object
+        states_of_response = defaultdict(set)  # type: Dict[int, Set[EcuState]]  # noqa: E501
+        for r in self.results_with_response:
+            states_of_response[id(r.resp)].add(r.state)
+
         supported_resps = list()
-        all_responses = [p for p in self.__result_packets.values()
-                         if orb(bytes(p)[0]) & 0x40]
-        for resp in all_responses:
-            states = list(set([t.state for t in self.results_with_response
-                               if t.resp == resp]))
+        for resp in self.__response_packets:
+            states = list(states_of_response.get(id(resp), []))
             supported_resps.append(EcuResponse(state=states, responses=resp))
         return supported_resps
 
@@ -565,7 +827,7 @@ class StateGeneratingServiceEnumerator(ServiceEnumerator, StateGenerator):
         except IndexError:
             return None
 
-        if resp is not None and EcuState.is_modifier_pkt(resp):
+        if resp is not None and self._is_modifier_response(resp):
             new_state = EcuState.get_modified_ecu_state(resp, req, state)
             if new_state == state:
                 return None